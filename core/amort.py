@@ -1,35 +1,115 @@
 
+import math
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 
-def amort_schedule(principal, annual_rate, term_months, extra_fn=lambda t: 0.0, payment=None):
+SCHEDULE_COLUMNS = ["Month", "Payment", "Interest", "Principal", "Extra", "Balance"]
+
+def _level_payment(principal, r, growth_at_term):
+    """Level payment for monthly rate r != 0 given (1 + r) ** term."""
+    return (r * principal) / (1.0 - 1.0 / growth_at_term)
+
+def monthly_payment(principal, annual_rate, term_months):
+    """Level monthly payment that retires `principal` over `term_months`."""
+    if term_months <= 0:
+        return 0.0
+    r = annual_rate / 12.0
+    if r == 0:
+        return principal / term_months
+    return _level_payment(principal, r, math.pow(1.0 + r, term_months))
+
+def _no_extra(t):
+    return 0.0
+
+@lru_cache(maxsize=512)
+def _amort_core(principal, r, pmt, term_months, extra_key=None, extra_constant=0.0):
+    """Solve the balance recurrence for every month at once.
+
+    bal[t] = bal[t-1] * (1 + r) - (pmt + extra[t]) unrolls to
+    (1 + r)^t * (principal - sum_k (pmt + extra[k]) / (1 + r)^k).
+
+    pmt=None means the level payment, derived from the same (1 + r)^t array
+    the balances use rather than a second power.
+
+    extra_key is None for no per-month extra principal, else the raw bytes of the
+    float64 extra array, so identical schedules are only solved once.
+    extra_constant is added to every month's extra. Returns read-only arrays in
+    SCHEDULE_COLUMNS order.
+    """
+    months = np.arange(1, term_months + 1)
+    if extra_key is None:
+        extra = np.full(term_months, extra_constant)
+    else:
+        extra = np.frombuffer(extra_key, dtype=float) + extra_constant
+    if r == 0:
+        if pmt is None:
+            pmt = monthly_payment(principal, 0.0, term_months)
+        balance = principal - np.cumsum(pmt + extra)
+    else:
+        growth = np.power(1.0 + r, months)
+        if pmt is None:
+            pmt = _level_payment(principal, r, growth[-1]) if term_months > 0 else 0.0
+        balance = growth * (principal - np.cumsum((pmt + extra) / growth))
+
+    # Stop at the first month the loan is retired, as the month-by-month loop does.
+    paid_off = balance <= 0.0
+    if paid_off.any():
+        last = int(np.argmax(paid_off)) + 1
+        months = months[:last]
+        extra = extra[:last]
+        balance = balance[:last]
+    balance = np.maximum(balance, 0.0)
+
+    interest = np.empty(len(balance))
+    if len(balance):
+        interest[0] = principal * r
+        interest[1:] = balance[:-1] * r
+
+    arrays = (months, np.full(len(balance), pmt), interest, pmt - interest, np.array(extra), balance)
+    for arr in arrays:
+        arr.setflags(write=False)
+    return arrays
+
+def clear_cache():
+    """Drop memoized amortization results (mainly for tests)."""
+    _amort_core.cache_clear()
+
+def amort_arrays(principal, annual_rate, term_months, extra_fn=_no_extra, payment=None, extra_array=None,
+                 extra_constant=0.0):
+    """Like amort_schedule, but return the read-only column arrays as a tuple.
+
+    Order follows SCHEDULE_COLUMNS: Month, Payment, Interest, Principal, Extra, Balance.
+    """
+    r = annual_rate / 12.0
+    pmt = None if payment is None else float(payment)
+    term_months = max(int(term_months), 0)
+    extra_key = None
+    if extra_array is not None:
+        given = np.asarray(extra_array, dtype=float)[:term_months]
+        extra = np.zeros(term_months)
+        extra[:len(given)] = given
+        extra_key = extra.tobytes() if extra.any() else None
+    elif extra_fn is not _no_extra:
+        extra = np.fromiter(
+            (float(extra_fn(t) or 0.0) for t in range(1, term_months + 1)),
+            dtype=float,
+            count=term_months,
+        )
+        extra_key = extra.tobytes() if extra.any() else None
+
+    return _amort_core(float(principal), float(r), pmt, term_months, extra_key, float(extra_constant or 0.0))
+
+def amort_schedule(principal, annual_rate, term_months, extra_fn=_no_extra, payment=None, extra_array=None,
+                   extra_constant=0.0):
     """Generate an amortization DataFrame for fixed-rate loans.
 
+    extra_array: optional per-month extra principal (index 0 = month 1); when given
+    it takes precedence over extra_fn and months beyond its length get no extra.
+    extra_constant: flat extra principal added every month, on top of either.
+
     Returns columns: Month, Payment, Interest, Principal, Extra, Balance
     """
-    r = annual_rate / 12.0
-    if payment is None:
-        if r == 0:
-            pmt = principal / term_months
-        else:
-            # numpy financial pmt replacement
-            pmt = (r * principal) / (1 - (1 + r) ** (-term_months))
-    else:
-        pmt = float(payment)
-
-    bal = principal
-    rows = []
-
-    for t in range(1, term_months + 1):
-        interest = bal * r
-        principal_paid = pmt - interest
-        extra = float(extra_fn(t) or 0.0)
-        total_principal = principal_paid + extra
-        bal = max(0.0, bal - total_principal)
-        rows.append([t, pmt, interest, principal_paid, extra, bal])
-        if bal <= 0.0:
-            break
-
-    return pd.DataFrame(rows, columns=[
-        "Month","Payment","Interest","Principal","Extra","Balance"
-    ])
+    arrays = amort_arrays(principal, annual_rate, term_months, extra_fn, payment, extra_array, extra_constant)
+    return pd.DataFrame(dict(zip(SCHEDULE_COLUMNS, arrays)))
@@ -1,5 +1,9 @@
+import hashlib
 import math
+import os
+import pickle
 import re
+import tempfile
 from pathlib import Path
 from typing import Dict, Iterable, Optional, Tuple
 
@@ -7,6 +11,57 @@ import numpy as np
 import pandas as pd
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+CACHE_DIR = DATA_DIR / ".cache"
+
+# Bump when loader logic or the bundle returned by prepare_portfolio_factors
+# changes; it is part of every cache file name/key, so old caches are ignored.
+_BUNDLE_VERSION = 1
+_CACHE_ERRORS = (ImportError, OSError, ValueError, NotImplementedError)
+FACTOR_SOURCES = ("cpi_index.xlsx", "spx_factors.xlsx", "global_factors.xlsx")
+_NON_WORD_RE = re.compile(r"[^0-9a-zA-Z]+")
+_UNDERSCORE_RE = re.compile(r"_+")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def _parquet_path(source: Path, name: str) -> Path:
+    """Cache file for one parsed table, keyed on the exact source path, mtime, and size.
+
+    Any change to the workbook (including restoring an older copy) or a different
+    workbook with the same file name maps to a different entry, so a hit is exact.
+    """
+    source = source.resolve()
+    stat = source.stat()
+    owner = _digest(str(source))
+    stamp = _digest(f"{stat.st_mtime_ns}:{stat.st_size}")
+    return CACHE_DIR / f"{name}_{owner}_{stamp}_v{_BUNDLE_VERSION}.parquet"
+
+
+def _read_cached(source: Path, name: str) -> Optional[pd.DataFrame]:
+    """Return the parquet copy of a parsed workbook if it matches the source exactly."""
+    try:
+        return pd.read_parquet(_parquet_path(source, name))
+    except _CACHE_ERRORS:
+        return None
+
+
+def _write_cached(frame: pd.DataFrame, source: Path, name: str) -> None:
+    """Best-effort parquet cache write; skipped when pyarrow or the disk is unavailable.
+
+    Older entries for the same source and table are removed so the cache does not grow.
+    """
+    try:
+        cache_path = _parquet_path(source, name)
+        CACHE_DIR.mkdir(exist_ok=True)
+        frame.to_parquet(cache_path, compression="zstd")
+        owner_prefix = cache_path.name.rsplit("_", 2)[0]
+        for stale in CACHE_DIR.glob(f"{owner_prefix}_*.parquet"):
+            if stale != cache_path:
+                stale.unlink()
+    except _CACHE_ERRORS:
+        pass
 
 
 def _coerce_month(series: pd.Series) -> pd.Series:
@@ -29,6 +84,11 @@ def load_cpi_index(path: Optional[Path] = None) -> Tuple[pd.DataFrame, pd.DataFr
         cpi_factor_yoy     - growth factor versus prior year (1 + cpi_yoy)
     """
     path = Path(path or DATA_DIR / "cpi_index.xlsx")
+    monthly = _read_cached(path, f"{path.stem}_monthly")
+    annual = _read_cached(path, f"{path.stem}_annual")
+    if monthly is not None and annual is not None:
+        return monthly, annual
+
     df = pd.read_excel(path)
     if "Date" not in df.columns or "CPI" not in df.columns:
         raise ValueError("Expected 'Date' and 'CPI' columns in CPI sheet.")
@@ -54,13 +114,16 @@ def load_cpi_index(path: Optional[Path] = None) -> Tuple[pd.DataFrame, pd.DataFr
         CPI_Factor_Month=1.0 + df["CPI"].pct_change()
     )
 
-    return df[["CPI", "CPI_YoY", "CPI_Factor_Month"]], annual
+    monthly = df[["CPI", "CPI_YoY", "CPI_Factor_Month"]]
+    _write_cached(monthly, path, f"{path.stem}_monthly")
+    _write_cached(annual, path, f"{path.stem}_annual")
+    return monthly, annual
 
 
 def _clean_column(name: str) -> str:
     """Normalize column headers to snake_case without spaces."""
-    name = re.sub(r"[^0-9a-zA-Z]+", "_", name.strip())
-    name = re.sub(r"_+", "_", name)
+    name = _NON_WORD_RE.sub("_", name.strip())
+    name = _UNDERSCORE_RE.sub("_", name)
     return name.lower().strip("_")
 
 
@@ -80,10 +143,7 @@ def load_factor_table(
     path = DATA_DIR / filename
     df = pd.read_excel(path)
 
-    column_map: Dict[str, str] = {}
-    for col in df.columns:
-        column_map[col] = _clean_column(col)
-    df = df.rename(columns=column_map)
+    df.columns = [_clean_column(col) for col in df.columns]
 
     if begin_col:
         begin_key = _clean_column(begin_col)
@@ -110,8 +170,7 @@ def load_factor_table(
         factor_cols = [c for c in factor_cols if c in normalized]
 
     # Coerce factor columns to numeric and drop trailing commentary rows.
-    for col in factor_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df[factor_cols] = df[factor_cols].apply(pd.to_numeric, errors="coerce")
 
     df = df.dropna(subset=factor_cols, how="all")
 
@@ -131,18 +190,30 @@ def load_factor_table(
 
 def load_spx_factors() -> pd.DataFrame:
     """Convenience wrapper for the SPX factor workbook."""
-    return load_factor_table("spx_factors.xlsx", begin_col="begin month", end_col="end month")
+    source = DATA_DIR / "spx_factors.xlsx"
+    cached = _read_cached(source, "spx_factors")
+    if cached is not None:
+        return cached
+    df = load_factor_table("spx_factors.xlsx", begin_col="begin month", end_col="end month")
+    _write_cached(df, source, "spx_factors")
+    return df
 
 
 def load_global_factors() -> pd.DataFrame:
     """Convenience wrapper for the Global factor workbook."""
+    source = DATA_DIR / "global_factors.xlsx"
+    cached = _read_cached(source, "global_factors")
+    if cached is not None:
+        return cached
     df = load_factor_table("global_factors.xlsx")
     rename_map = {
         col: col.replace("lbm_", "global_")
         for col in df.columns
         if col.startswith("lbm_")
     }
-    return df.rename(columns=rename_map)
+    df = df.rename(columns=rename_map)
+    _write_cached(df, source, "global_factors")
+    return df
 
 
 def geometric_mean(series: pd.Series) -> float:
@@ -153,8 +224,57 @@ def geometric_mean(series: pd.Series) -> float:
     return float(np.exp(logs.mean()))
 
 
+def factor_source_mtimes() -> Tuple[float, ...]:
+    """Modification times of the source workbooks, usable as a cache key."""
+    return tuple((DATA_DIR / name).stat().st_mtime for name in FACTOR_SOURCES)
+
+
 def prepare_portfolio_factors() -> Dict[str, Dict[str, object]]:
-    """Load CPI, SPX, and Global factors and harmonize into a single bundle."""
+    """Load CPI, SPX, and Global factors and harmonize into a single bundle.
+
+    The bundle is pickled under CACHE_DIR and reused until any source workbook
+    changes, so cold starts skip Excel parsing entirely.
+    """
+    try:
+        cache_key = (_BUNDLE_VERSION, factor_source_mtimes())
+    except OSError:
+        cache_key = None
+
+    bundle_path = CACHE_DIR / "portfolios.pkl"
+    if cache_key is not None:
+        try:
+            with open(bundle_path, "rb") as fh:
+                payload = pickle.load(fh)
+            if payload.get("key") == cache_key:
+                return payload["bundle"]
+        except Exception:
+            # Any unreadable cache (truncated, foreign protocol, other pandas) is rebuilt.
+            pass
+
+    bundle = _build_portfolio_factors()
+    if cache_key is not None:
+        tmp_path = None
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            # Write beside the target and swap in atomically so readers never see a partial file.
+            with tempfile.NamedTemporaryFile("wb", dir=CACHE_DIR, suffix=".tmp", delete=False) as fh:
+                tmp_path = fh.name
+                pickle.dump({"key": cache_key, "bundle": bundle}, fh)
+            os.replace(tmp_path, bundle_path)
+            tmp_path = None
+        except (OSError, pickle.PicklingError):
+            pass
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+    return bundle
+
+
+def _build_portfolio_factors() -> Dict[str, Dict[str, object]]:
+    """Parse the source workbooks and assemble the factor bundle."""
     cpi_monthly, cpi_annual = load_cpi_index()
     spx = load_spx_factors()
     global_df = load_global_factors()
@@ -176,22 +296,18 @@ def prepare_portfolio_factors() -> Dict[str, Dict[str, object]]:
         if real.empty:
             return real
 
-        factors = []
-        cpi_tail = cpi_row_factors.iloc[-len(real):] if len(cpi_row_factors) >= len(real) else None
-        for idx, value in enumerate(real):
-            if cpi_tail is not None:
-                cpi_factor = float(cpi_tail.iloc[idx])
-            elif idx < len(cpi_row_factors):
-                cpi_factor = float(cpi_row_factors.iloc[idx])
-            else:
-                cpi_factor = 1.0
-            if not np.isfinite(cpi_factor) or cpi_factor <= 0.0:
-                cpi_factor = 1.0
-            nominal = float(value) * cpi_factor
-            if nominal <= 0.0 or not np.isfinite(nominal):
-                nominal = 1.0
-            factors.append(nominal)
-        return pd.Series(factors, index=real.index, name=label)
+        # Align CPI to the tail of the window when history allows, else from the start.
+        n = len(real)
+        cpi_values = cpi_row_factors.to_numpy()
+        cpi = np.ones(n)
+        if len(cpi_values) >= n:
+            cpi[:] = cpi_values[-n:]
+        else:
+            cpi[:len(cpi_values)] = cpi_values
+        cpi = np.where(np.isfinite(cpi) & (cpi > 0.0), cpi, 1.0)
+        nominal = real.to_numpy() * cpi
+        nominal = np.where(np.isfinite(nominal) & (nominal > 0.0), nominal, 1.0)
+        return pd.Series(nominal, index=real.index, name=label)
 
     for col in spx_aligned.columns:
         if col == "end_month":
@@ -199,7 +315,6 @@ def prepare_portfolio_factors() -> Dict[str, Dict[str, object]]:
         series = spx_aligned[col].astype(float)
         nominal_series = to_nominal(series, col)
         portfolio_series[col] = nominal_series.reset_index(drop=True)
-        portfolio_cagr[col] = geometric_mean(nominal_series)
 
     for col in global_aligned.columns:
         if col == "end_month":
@@ -207,7 +322,22 @@ def prepare_portfolio_factors() -> Dict[str, Dict[str, object]]:
         series = global_aligned[col].astype(float)
         nominal_series = to_nominal(series, col)
         portfolio_series[col] = nominal_series.reset_index(drop=True)
-        portfolio_cagr[col] = geometric_mean(nominal_series)
+
+    # Geometric mean of every portfolio in one pass; columns with no data default to 1.0.
+    names = list(portfolio_series)
+    matrix = pd.DataFrame(portfolio_series, columns=names).to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.log(np.where(matrix > 0.0, matrix, np.nan))
+    counts = np.isfinite(logs).sum(axis=0)
+    sums = np.nansum(logs, axis=0)
+    cagr = np.where(counts > 0, np.exp(sums / np.maximum(counts, 1)), 1.0)
+    portfolio_cagr.update(zip(names, cagr.tolist()))
+
+    # Sanitized ndarray copies so the comparator can index rolling windows directly.
+    portfolio_arrays: Dict[str, np.ndarray] = {}
+    for key, series in portfolio_series.items():
+        arr = series.to_numpy(dtype=float)
+        portfolio_arrays[key] = np.where(np.isfinite(arr) & (arr > 0.0), arr, 1.0)
 
     return {
         "cpi_monthly": cpi_monthly,
@@ -215,5 +345,6 @@ def prepare_portfolio_factors() -> Dict[str, Dict[str, object]]:
         "spx": spx_aligned,
         "global": global_aligned,
         "portfolios": portfolio_series,
+        "portfolio_arrays": portfolio_arrays,
         "portfolio_cagr": portfolio_cagr,
     }
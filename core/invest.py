@@ -2,15 +2,27 @@
 import pandas as pd
 import numpy as np
 
+def _side_portfolio_loop(lump, contribs, factors):
+    v = lump
+    values = np.empty(len(contribs))
+    for i in range(len(contribs)):
+        v = v * factors[i] + contribs[i]
+        values[i] = v
+    return values
+
 def side_portfolio(lump_sum, monthly_contribs, factor_series):
     """Grow a side portfolio using monthly total return factors.
     factor_series: iterable of monthly multipliers (e.g., 1.01 = +1%)
     """
-    v = float(lump_sum or 0.0)
-    values = []
-    n = len(monthly_contribs)
-    for i in range(n):
-        f = float(factor_series[i]) if i < len(factor_series) else 1.0
-        v = v * f + float(monthly_contribs[i] or 0.0)
-        values.append(v)
-    return pd.Series(values)
+    lump = float(lump_sum or 0.0)
+    contribs = np.nan_to_num(np.asarray(monthly_contribs, dtype=float), nan=0.0)
+    n = len(contribs)
+    factors = np.ones(n)
+    given = np.asarray(factor_series, dtype=float)[:n]
+    factors[:len(given)] = given
+
+    # v[i] = v[i-1] * f[i] + c[i] unrolls to cp[i] * (lump + sum_k c[k] / cp[k]).
+    growth = np.cumprod(factors)
+    if n == 0 or not np.all(np.isfinite(growth)) or np.min(np.abs(growth)) < 1e-12:
+        return pd.Series(_side_portfolio_loop(lump, contribs, factors))
+    return pd.Series(growth * (lump + np.cumsum(contribs / growth)))
@@ -1,29 +1,28 @@
 
 import numpy as np
 
+_CANCEL_LTV = {"78": 0.78, "80": 0.80}
+
 def pmi_stream(bal_series, home_val_series, pmi_rate, basis="original", cancel_rule="78"):
     """Return a numpy array of monthly PMI payments.
 
     basis: "original" or "current"
     cancel_rule: "78", "80", or "FHA_life"
     """
-    n = len(bal_series)
-    pmi = np.zeros(n)
-    active = True
-    orig_bal = bal_series[0]
+    bal = np.asarray(bal_series, dtype=float)
+    n = len(bal)
+    if n == 0:
+        return np.zeros(0)
 
-    for t in range(n):
-        ltv = bal_series[t] / home_val_series[t]
-        if cancel_rule == "FHA_life":
-            active = True
-        elif cancel_rule == "78" and ltv <= 0.78:
-            active = False
-        elif cancel_rule == "80" and ltv <= 0.80:
-            active = False
+    # PMI stays on until the first month LTV reaches the cutoff, then never returns.
+    cancel_idx = n
+    cutoff = _CANCEL_LTV.get(cancel_rule)
+    if cutoff is not None:
+        ltv = bal / np.asarray(home_val_series[:n], dtype=float)
+        hit = ltv <= cutoff
+        if hit.any():
+            cancel_idx = int(np.argmax(hit))
 
-        if active:
-            base = bal_series[t] if basis == "current" else orig_bal
-            pmi[t] = (pmi_rate / 12.0) * base
-        else:
-            pmi[t] = 0.0
-    return pmi
+    base = bal if basis == "current" else np.full(n, bal[0])
+    active = np.arange(n) < cancel_idx
+    return np.where(active, (pmi_rate / 12.0) * base, 0.0)
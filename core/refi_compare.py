@@ -1,7 +1,7 @@
 
 import numpy as np
 import pandas as pd
-from .amort import amort_schedule
+from .amort import amort_arrays, monthly_payment
 from .pmi import pmi_stream
 from .utils import home_value_path
 
@@ -47,15 +47,11 @@ def compare_refi_scenarios(
         return (months + 11) // 12
 
     def build_annual_contributions(monthly_values, years_required):
-        annual = []
-        for year in range(years_required):
-            start = year * 12
-            end = min(start + 12, len(monthly_values))
-            if start >= len(monthly_values):
-                annual.append(0.0)
-            else:
-                annual.append(float(sum(monthly_values[start:end])))
-        return annual
+        monthly = np.asarray(monthly_values, dtype=float)
+        padded_len = years_required * 12
+        if len(monthly) < padded_len:
+            monthly = np.pad(monthly, (0, padded_len - len(monthly)))
+        return monthly[:padded_len].reshape(years_required, 12).sum(axis=1)
 
     def build_annual_factor_paths(portfolio_key, years_required):
         if years_required <= 0 or not invest_savings or not factors:
@@ -63,84 +59,64 @@ def compare_refi_scenarios(
 
         portfolios = factors.get("portfolios", {})
         geo = factors.get("portfolio_cagr", {})
-        series = portfolios.get(portfolio_key)
         fee_multiplier = max(0.0, 1.0 - fee_drag)
 
-        if series is None or len(series) == 0:
+        # Prefer the arrays sanitized once at load time; fall back to the raw series.
+        arr = factors.get("portfolio_arrays", {}).get(portfolio_key)
+        if arr is None:
+            series = portfolios.get(portfolio_key)
+            if series is not None:
+                arr = series.to_numpy(dtype=float)
+                arr = np.where(np.isfinite(arr) & (arr > 0.0), arr, 1.0)
+
+        if arr is None or len(arr) == 0:
             fallback = float(geo.get(portfolio_key, 1.0) or 1.0)
             if not np.isfinite(fallback) or fallback <= 0.0:
                 fallback = 1.0
-            return [[fallback * fee_multiplier] * years_required]
-
-        series = series.astype(float)
-        max_start = len(series) - (years_required - 1) * 12
-        paths = []
-        for start in range(max(0, max_start)):
-            path = []
-            for step in range(years_required):
-                idx = start + step * 12
-                if idx >= len(series):
-                    break
-                factor = float(series.iloc[idx])
-                if not np.isfinite(factor) or factor <= 0.0:
-                    factor = 1.0
-                path.append(factor * fee_multiplier)
-            if len(path) == years_required:
-                paths.append(path)
-
-        if not paths:
+            return np.full((1, years_required), fallback * fee_multiplier)
+
+        max_start = len(arr) - (years_required - 1) * 12
+        if max_start <= 0:
             fallback = float(geo.get(portfolio_key, 1.0) or 1.0)
             if not np.isfinite(fallback) or fallback <= 0.0:
                 fallback = 1.0
-            paths.append([fallback * fee_multiplier] * years_required)
-        return paths
+            return np.full((1, years_required), fallback * fee_multiplier)
+
+        # Row i holds the annual factors for the window starting at month i.
+        idx = np.arange(max_start)[:, None] + np.arange(years_required)[None, :] * 12
+        return arr[idx] * fee_multiplier
 
     def grow_side_value_paths(side0, annual_contribs, factor_paths):
-        if not factor_paths:
-            return [float(side0)]
-
-        values = []
-        for factors in factor_paths:
-            v = float(side0)
-            for year, factor in enumerate(factors):
-                contrib = annual_contribs[year] if year < len(annual_contribs) else 0.0
-                v += contrib
-                v *= factor
-            # Handle any residual contributions beyond the final factor year.
-            if len(annual_contribs) > len(factors):
-                for year in range(len(factors), len(annual_contribs)):
-                    v += annual_contribs[year]
-            values.append(v)
+        if len(factor_paths) == 0:
+            return np.array([float(side0)])
+
+        # Advance every rolling-window path together, one year at a time.
+        paths = np.asarray(factor_paths, dtype=float)
+        contribs = np.asarray(annual_contribs, dtype=float)
+        years = paths.shape[1]
+        values = np.full(paths.shape[0], float(side0))
+        for year in range(years):
+            contrib = contribs[year] if year < len(contribs) else 0.0
+            values = (values + contrib) * paths[:, year]
+        # Handle any residual contributions beyond the final factor year.
+        if len(contribs) > years:
+            values += contribs[years:].sum()
         return values
 
     def build_home_value_path(months: int):
         if months <= 0:
-            return home_value_path(base_home_value, home_appreciation, 1), pd.Series([1.0])
+            return home_value_path(base_home_value, home_appreciation, 1), np.ones(1)
 
-        cpi_series = None
-        if factors:
+        # Use the most recent CPI history, front-aligned; months past it get no inflation.
+        cpi_factors = np.ones(months - 1)
+        if factors and months > 1:
             cpi_monthly = factors.get("cpi_monthly")
             if cpi_monthly is not None and "CPI_Factor_Month" in cpi_monthly.columns:
-                seq = cpi_monthly["CPI_Factor_Month"].dropna().astype(float)
-                if len(seq) > 0:
-                    if len(seq) >= months - 1:
-                        cpi_series = seq.iloc[-(months - 1):].reset_index(drop=True)
-                    else:
-                        cpi_series = seq.reset_index(drop=True)
-
-        cpi_factors = []
-        cpi_levels = [1.0]
-        last_valid = 1.0
-        for i in range(months - 1):
-            if cpi_series is not None and i < len(cpi_series):
-                factor = float(cpi_series.iloc[i])
-            else:
-                factor = 1.0
-            if not np.isfinite(factor) or factor <= 0.0:
-                factor = 1.0
-            cpi_factors.append(factor)
-            cpi_levels.append(cpi_levels[-1] * factor)
-            last_valid = factor
+                seq = cpi_monthly["CPI_Factor_Month"].dropna().to_numpy(dtype=float)
+                seq = seq[len(seq) - min(len(seq), months - 1):]
+                cpi_factors[:len(seq)] = seq
+        cpi_factors = np.where(np.isfinite(cpi_factors) & (cpi_factors > 0.0), cpi_factors, 1.0)
+        cpi_levels = np.concatenate(([1.0], np.cumprod(cpi_factors)))
 
         hv_series = home_value_path(
             base_home_value,
@@ -148,53 +124,46 @@ def compare_refi_scenarios(
             months,
             monthly_factors=cpi_factors
         )
-        return hv_series, pd.Series(cpi_levels)
+        return hv_series, cpi_levels
 
     def pad_schedule(schedule, horizon):
-        if len(schedule) >= horizon:
-            return schedule.iloc[:horizon].copy()
-
-        last_month = int(schedule.iloc[-1]["Month"]) if len(schedule) else 0
-        last_balance = float(schedule.iloc[-1]["Balance"]) if len(schedule) else 0.0
-        padding = []
-        remaining = horizon - len(schedule)
-        for i in range(remaining):
-            padding.append([
-                last_month + i + 1,
-                0.0,
-                0.0,
-                0.0,
-                0.0,
-                last_balance
-            ])
-
-        if padding:
-            pad_df = pd.DataFrame(padding, columns=schedule.columns)
-            schedule = pd.concat([schedule, pad_df], ignore_index=True)
-        return schedule.iloc[:horizon].copy()
+        """Return (payment, extra, balance) trimmed or padded to `horizon` months."""
+        _, payment, _, _, extra, balance = schedule
+        filled = len(balance)
+        if filled >= horizon:
+            return payment[:horizon], extra[:horizon], balance[:horizon]
+
+        padded = tuple(np.zeros(horizon) for _ in range(3))
+        for out, values in zip(padded, (payment, extra, balance)):
+            out[:filled] = values
+        padded[2][filled:] = balance[-1] if filled else 0.0
+        return padded
 
     results = []
     # Baseline schedule (keep current loan as-is)
-    sched_cur = amort_schedule(
+    sched_cur = amort_arrays(
         current["balance"],
         current["rate"],
         int(current["remaining_term"]),
         payment=current_payment
     )
-    sched_cur = pad_schedule(sched_cur, horizon_months)
+    payment_cur, extra_cur, balance_cur = pad_schedule(sched_cur, horizon_months)
     home_values, cpi_levels = build_home_value_path(horizon_months)
-    cpi_horizon = float(cpi_levels.iloc[-1]) if len(cpi_levels) else 1.0
+    cpi_horizon = float(cpi_levels[-1]) if len(cpi_levels) else 1.0
     if not np.isfinite(cpi_horizon) or cpi_horizon <= 0.0:
         cpi_horizon = 1.0
+    # Home values depend only on the current loan inputs, so every option shares one path.
     hv = home_values
-    pmi_cur = pmi_stream(sched_cur["Balance"].values, hv.values, current["pmi_rate"], pmi_basis, current["cancel_rule"])
-    total_cur = (sched_cur["Payment"] + sched_cur["Extra"]).sum() + pmi_cur.sum()
-    equity_cur = hv.iloc[-1] - sched_cur.iloc[-1]["Balance"]
+    hv_values = hv.to_numpy()
+    hv_end = float(hv_values[-1])
+    pmi_cur = pmi_stream(balance_cur, hv_values, current["pmi_rate"], pmi_basis, current["cancel_rule"])
+    total_cur = np.sum(payment_cur + extra_cur) + np.sum(pmi_cur)
+    equity_cur = hv_end - balance_cur[-1]
     side_cur = 0.0  # no side portfolio in baseline by default
     cash_delta_cur = 0.0
     networth_cur = float(equity_cur + side_cur + cash_delta_cur)
     networth_cur_real = float(networth_cur / cpi_horizon)
-    base_payment = float(sched_cur.iloc[0]["Payment"] + sched_cur.iloc[0]["Extra"])
+    base_payment = float(payment_cur[0] + extra_cur[0])
 
     results.append({
         "Option": "Keep Current",
@@ -217,55 +186,39 @@ def compare_refi_scenarios(
         "Net Worth Real Min @H": networth_cur_real,
     })
 
-    # Pre-calc fee info for investment and financing logic
-    opt_info = []
-    max_cash_needed = 0.0
-    for opt in options:
-        points_amt = float(opt.get("points", 0.0)) * current["balance"]
-        fees_amt = float(opt.get("fees", 0.0)) + points_amt
-        finance = bool(opt.get("finance_fees", False))
-        cash_needed = 0.0 if finance else fees_amt
-        max_cash_needed = max(max_cash_needed, cash_needed)
-        opt_info.append({
-            "opt": opt,
-            "points_amt": points_amt,
-            "fees_amt": fees_amt,
-            "finance": finance,
-            "cash_needed": cash_needed,
-        })
+    # Pre-calc fee info for investment and financing logic, one array per field
+    option_rates = np.array([float(opt["rate"]) for opt in options], dtype=float)
+    option_terms = np.array([int(opt["term"]) for opt in options], dtype=np.int64)
+    option_points = np.array([float(opt.get("points", 0.0)) for opt in options], dtype=float) * current["balance"]
+    option_fees = np.array([float(opt.get("fees", 0.0)) for opt in options], dtype=float) + option_points
+    option_finance = np.array([bool(opt.get("finance_fees", False)) for opt in options], dtype=bool)
+    option_cash_needed = np.where(option_finance, 0.0, option_fees)
+    option_start_principals = current["balance"] + np.where(option_finance, option_fees, 0.0)
+    max_cash_needed = float(option_cash_needed.max(initial=0.0))
 
     # Placeholder for refi options; expand with fees/points/financing and side-portfolio logic
-    for info in opt_info:
-        opt = info["opt"]
-        points_amt = info["points_amt"]
-        fees_amt = info["fees_amt"]
-        finance = info["finance"]
-        cash_needed = info["cash_needed"]
-        start_principal = current["balance"] + (fees_amt if finance else 0.0)
-        base_sched = amort_schedule(start_principal, float(opt["rate"]), int(opt["term"]))
-        base_pmt = float(base_sched.iloc[0]["Payment"])
+    for i, opt in enumerate(options):
+        rate = float(option_rates[i])
+        term = int(option_terms[i])
+        fees_amt = float(option_fees[i])
+        finance = bool(option_finance[i])
+        cash_needed = float(option_cash_needed[i])
+        start_principal = float(option_start_principals[i])
+        base_pmt = monthly_payment(start_principal, rate, term)
 
         extra_payment = 0.0
         if keep_payment:
             extra_payment = max(0.0, base_payment - base_pmt)
 
-        if extra_payment > 0.0:
-            sched = amort_schedule(
-                start_principal,
-                float(opt["rate"]),
-                int(opt["term"]),
-                extra_fn=lambda _t, extra=extra_payment: extra
-            )
-        else:
-            sched = base_sched
+        sched = amort_arrays(start_principal, rate, term, extra_constant=extra_payment)
 
-        sched = pad_schedule(sched, horizon_months)
+        payment, extra, balance = pad_schedule(sched, horizon_months)
+        monthly_actual = payment + extra
 
-        hv_opt = home_values
-        pmi_opt = pmi_stream(sched["Balance"].values, hv_opt.values, current["pmi_rate"], pmi_basis, current["cancel_rule"])
+        pmi_opt = pmi_stream(balance, hv_values, current["pmi_rate"], pmi_basis, current["cancel_rule"])
 
-        total_cash = (sched["Payment"] + sched["Extra"]).sum() + pmi_opt.sum()
-        equity = hv_opt.iloc[-1] - sched.iloc[-1]["Balance"]
+        total_cash = np.sum(monthly_actual) + np.sum(pmi_opt)
+        equity = hv_end - balance[-1]
         # Side portfolio: lump sum equals unused upfront cash when investing is enabled
         side0 = 0.0
         if invest_savings:
@@ -273,40 +226,32 @@ def compare_refi_scenarios(
         cash_delta = float(total_cur - total_cash)
         years_needed = years_from_months(horizon_months)
         if invest_savings:
-            monthly_actual = (sched["Payment"] + sched["Extra"]).tolist()
-            monthly_savings = [float(base_payment - val) for val in monthly_actual]
+            monthly_savings = base_payment - monthly_actual
             annual_contribs = build_annual_contributions(monthly_savings, years_needed)
             factor_paths = build_annual_factor_paths(opt.get("portfolio"), years_needed)
             side_values = grow_side_value_paths(side0, annual_contribs, factor_paths)
         else:
-            side_values = [float(side0)]
+            side_values = np.array([float(side0)])
 
-        side_array = np.array(side_values, dtype=float)
-        side_median = float(np.median(side_array))
-        side_p75 = float(np.percentile(side_array, 75))
-        side_min = float(np.min(side_array))
-        side_real_array = side_array / cpi_horizon
-        side_real_median = float(np.median(side_real_array))
-        side_real_p75 = float(np.percentile(side_real_array, 75))
-        side_real_min = float(np.min(side_real_array))
+        side_array = np.asarray(side_values, dtype=float)
+        # Net worth is side value plus a constant, so one quantile pass covers every column.
+        side_min, side_median, side_p75 = (float(q) for q in np.quantile(side_array, [0.0, 0.5, 0.75]))
+        side_real_median = side_median / cpi_horizon
+        side_real_p75 = side_p75 / cpi_horizon
+        side_real_min = side_min / cpi_horizon
 
         cash_effect = 0.0 if invest_savings else cash_delta
-        networth_values = [
-            float(equity + side_val + cash_effect - (0.0 if finance else fees_amt))
-            for side_val in side_array
-        ]
-        networth_array = np.array(networth_values, dtype=float)
-        networth_median = float(np.median(networth_array))
-        networth_p75 = float(np.percentile(networth_array, 75))
-        networth_min = float(np.min(networth_array))
-        networth_real_array = networth_array / cpi_horizon
-        networth_real_median = float(np.median(networth_real_array))
-        networth_real_p75 = float(np.percentile(networth_real_array, 75))
-        networth_real_min = float(np.min(networth_real_array))
+        networth_offset = float(equity + cash_effect - (0.0 if finance else fees_amt))
+        networth_median = networth_offset + side_median
+        networth_p75 = networth_offset + side_p75
+        networth_min = networth_offset + side_min
+        networth_real_median = networth_median / cpi_horizon
+        networth_real_p75 = networth_p75 / cpi_horizon
+        networth_real_min = networth_min / cpi_horizon
 
         results.append({
             "Option": opt["name"],
-            "Monthly Payment": float(sched.iloc[0]["Payment"] + sched.iloc[0]["Extra"]),
+            "Monthly Payment": float(monthly_actual[0]),
             "PMI First Mo": pmi_opt[0],
             "Total Cash Out (H)": total_cash,
             "Cash Savings @H": cash_delta,
@@ -12,11 +12,9 @@ def home_value_path(v0, annual_appreciation=0.0, months=1, monthly_factors=None)
     applied sequentially. Otherwise, we fall back to a constant annual appreciation rate.
     """
     base_value = float(v0)
-    vals = [base_value]
     if months <= 1:
-        return pd.Series(vals)
+        return pd.Series([base_value])
 
-    monthly_factors = list(monthly_factors or [])
     if annual_appreciation is None:
         annual_appreciation = 0.0
     try:
@@ -28,12 +26,13 @@ def home_value_path(v0, annual_appreciation=0.0, months=1, monthly_factors=None)
     if not np.isfinite(fallback_factor) or fallback_factor <= 0.0:
         fallback_factor = 1.0
 
-    for idx in range(1, months):
-        if idx - 1 < len(monthly_factors):
-            factor = float(monthly_factors[idx - 1])
-            if not np.isfinite(factor) or factor <= 0.0:
-                factor = fallback_factor
-        else:
-            factor = fallback_factor
-        vals.append(vals[-1] * factor)
+    factors = np.full(months - 1, fallback_factor)
+    if monthly_factors is not None:
+        given = np.asarray(monthly_factors, dtype=float)[:months - 1]
+        given = np.where(~np.isfinite(given) | (given <= 0.0), fallback_factor, given)
+        factors[:len(given)] = given
+
+    vals = np.empty(months)
+    vals[0] = base_value
+    vals[1:] = base_value * np.cumprod(factors)
     return pd.Series(vals)
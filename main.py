@@ -1,7 +1,9 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
+from core.amort import monthly_payment
 from core.refi_compare import compare_refi_scenarios
-from core.factors import prepare_portfolio_factors
+from core.factors import factor_source_mtimes, prepare_portfolio_factors
 
 st.set_page_config(page_title="Refinance Optimizer", layout="wide", initial_sidebar_state="expanded")
 st.title("Refinance Optimizer (Starter)")
@@ -33,21 +35,13 @@ _Note: Home values automatically follow CPI inflation, PMI premiums use the curr
     """
 )
 
-def _monthly_payment(principal: float, annual_rate: float, term_months: int) -> float:
-    if term_months <= 0:
-        return 0.0
-    r = annual_rate / 12.0
-    if r == 0:
-        return principal / term_months
-    return (r * principal) / (1 - (1 + r) ** (-term_months))
-
 st.sidebar.header("Current Loan")
 cur_balance = st.sidebar.slider("Current balance ($)", min_value=0.0, max_value=2000000.0, value=700000.0, step=1000.0)
 cur_rate = st.sidebar.slider("Current rate (APR, %)", min_value=0.0, max_value=20.0, value=8.55, step=0.01) / 100.0
 cur_term = st.sidebar.slider("Remaining term (months)", min_value=1, max_value=360, value=360, step=1)
 home_value = st.sidebar.slider("Home value ($)", min_value=0.0, max_value=5000000.0, value=875000.0, step=1000.0)
 
-default_cur_payment = _monthly_payment(cur_balance, cur_rate, int(cur_term))
+default_cur_payment = monthly_payment(cur_balance, cur_rate, int(cur_term))
 cur_payment = st.sidebar.number_input(
     "Current monthly payment ($)",
     min_value=0.0,
@@ -89,11 +83,43 @@ base_options = [
     {"name":"Offer 2","rate":0.0615,"term":360,"fees":5000.0,"points":0.0,"finance_fees":False,"portfolio":"spx_60e"}
 ]
 
-@st.cache_data(show_spinner=False)
-def load_factor_data():
+# Only the bundle for the current workbook mtimes is ever needed.
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_factor_data(factor_id):
     return prepare_portfolio_factors()
 
-factor_data = load_factor_data()
+# Source workbook mtimes stand in for the factor bundle in cache keys.
+factor_id = factor_source_mtimes()
+factor_data = load_factor_data(factor_id)
+
+# Shared across sessions; bound it so slider positions and break-even probes get evicted.
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_compare(
+    current_items,
+    option_items,
+    horizon_months,
+    keep_payment,
+    invest_savings,
+    fee_drag,
+    current_payment,
+    factor_id,
+    _factors,
+):
+    """Memoized compare_refi_scenarios keyed on hashable scenario inputs.
+
+    The factor bundle is passed as `_factors` so Streamlit skips hashing it;
+    `factor_id` invalidates entries when the source workbooks change.
+    """
+    return compare_refi_scenarios(
+        current=dict(current_items),
+        options=[dict(items) for items in option_items],
+        factors=_factors,
+        horizon_months=horizon_months,
+        keep_payment=keep_payment,
+        invest_savings=invest_savings,
+        fee_drag=fee_drag,
+        current_payment=current_payment,
+    )
 
 portfolio_map = {
     "SPX 100/0": "spx100e",
@@ -222,17 +248,21 @@ current = {
     "cancel_rule": cancel_rule
 }
 
+def run_comparison(current: dict, options: list):
+    return cached_compare(
+        tuple(sorted(current.items())),
+        tuple(tuple(sorted(opt.items())) for opt in options),
+        int(horizon),
+        apply_savings,
+        invest_savings,
+        fee_drag,
+        cur_payment,
+        factor_id,
+        factor_data,
+    )
+
 st.write("🔧 Tip: use the savings mode selector to either keep, prepay, or invest payment savings.")
-results = compare_refi_scenarios(
-    current=current,
-    options=options,
-    factors=factor_data,
-    horizon_months=int(horizon),
-    keep_payment=apply_savings,
-    invest_savings=invest_savings,
-    fee_drag=fee_drag,
-    current_payment=cur_payment
-)
+results = run_comparison(current, options)
 
 summary = results.copy()
 
@@ -400,6 +430,54 @@ st.markdown(
 
 st.dataframe(summary.style.format(fmt), use_container_width=True)
 
+def _linear_breakeven_fee(evaluate, target, zero_value, probe=10_000.0, tolerance=1.0, max_fee=1_000_000.0):
+    """Solve for the break-even fee assuming net worth is affine in cash fees.
+
+    With fees paid out of pocket, net worth moves linearly in the fee, so two
+    points fix the line. The answer is re-evaluated once and None is returned
+    when it misses the target by more than `tolerance`, so the caller can fall
+    back to the bracketed search. That happens when investing savings: the
+    invested upfront-cash slack (max_cash_needed - cash_needed) kinks where
+    this offer's fee crosses the other offers' cash costs.
+    """
+    slope = (evaluate(probe) - zero_value) / probe
+    if not np.isfinite(slope) or slope >= 0.0:
+        return None
+    fee = min(max((target - zero_value) / slope, 0.0), max_fee)
+    if abs(evaluate(fee) - target) > tolerance:
+        return None
+    return fee
+
+def _solve_breakeven_fee(evaluate, target, low, low_value, high, high_value, tolerance=1.0, max_iter=30):
+    """Find the fee where evaluate(fee) == target inside a bracket [low, high].
+
+    Uses the Illinois variant of regula falsi: it keeps the bracket like bisection
+    but interpolates between the endpoints, so a nearly linear net-worth curve
+    converges in a handful of comparator runs instead of ~30.
+    """
+    f_low = low_value - target
+    f_high = high_value - target
+    last_side = 0
+    guess = low
+    for _ in range(max_iter):
+        if f_low == f_high:
+            break
+        guess = high - f_high * (high - low) / (f_high - f_low)
+        f_guess = evaluate(guess) - target
+        if abs(f_guess) <= tolerance:
+            break
+        if f_guess > 0:
+            low, f_low = guess, f_guess
+            if last_side > 0:
+                f_high /= 2.0
+            last_side = 1
+        else:
+            high, f_high = guess, f_guess
+            if last_side < 0:
+                f_low /= 2.0
+            last_side = -1
+    return guess
+
 def option_by_name(name: str):
     for opt in options:
         if opt["name"] == name:
@@ -422,16 +500,7 @@ if best_option["Option"] != "Keep Current":
                 new_opt["fees"] = float(candidate_fee)
                 new_opt["finance_fees"] = False
             modified.append(new_opt)
-        df = compare_refi_scenarios(
-            current=current,
-            options=modified,
-            factors=factor_data,
-            horizon_months=int(horizon),
-            keep_payment=apply_savings,
-            invest_savings=invest_savings,
-            fee_drag=fee_drag,
-            current_payment=cur_payment
-        )
+        df = run_comparison(current, modified)
         return df.loc[df["Option"] == target_name, raw_col].iloc[0]
 
     if st.button("Solve break-even closing costs for preferred offer"):
@@ -451,28 +520,30 @@ if best_option["Option"] != "Keep Current":
                         "Even at $0 closing costs this offer would not beat the alternative."
                     )
                 else:
-                    high = max(current_fee, 1000.0)
-                    high_value = evaluate_networth_with_fee(high)
-                    attempts = 0
-                    while high_value > competitor_value and high < 1_000_000 and attempts < 20:
-                        high *= 2
+                    breakeven_fee = _linear_breakeven_fee(
+                        evaluate_networth_with_fee, competitor_value, low_value
+                    )
+                    if breakeven_fee is None:
+                        high = max(current_fee, 1000.0)
                         high_value = evaluate_networth_with_fee(high)
-                        attempts += 1
-
-                    if high_value > competitor_value:
-                        st.info("The offer remains better even with extremely high closing costs.")
-                    else:
-                        for _ in range(30):
-                            mid = (low + high) / 2.0
-                            mid_value = evaluate_networth_with_fee(mid)
-                            if abs(mid_value - competitor_value) <= 1.0:
-                                low = high = mid
-                                break
-                            if mid_value > competitor_value:
-                                low = mid
-                            else:
-                                high = mid
-                        breakeven_fee = (low + high) / 2.0
+                        attempts = 0
+                        while high_value > competitor_value and high < 1_000_000 and attempts < 20:
+                            high *= 2
+                            high_value = evaluate_networth_with_fee(high)
+                            attempts += 1
+
+                        if high_value > competitor_value:
+                            st.info("The offer remains better even with extremely high closing costs.")
+                        else:
+                            breakeven_fee = _solve_breakeven_fee(
+                                evaluate_networth_with_fee,
+                                competitor_value,
+                                low,
+                                low_value,
+                                high,
+                                high_value,
+                            )
+                    if breakeven_fee is not None:
                         st.info(
                             f"{target_name} would tie {competitor_row['Option']} if its cash closing costs were about "
                             f"${breakeven_fee:,.0f} (paid out of pocket)."